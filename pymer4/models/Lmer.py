@@ -38,6 +38,10 @@ numpy2ri.activate()
 consolewrite_warning_backup = callbacks.consolewrite_warnerror
 consolewrite_print_backup = callbacks.consolewrite_print
 
+# Compiled R simulate() wrappers keyed by re.form so repeated simulate calls
+# don't re-parse the same R code
+_simulate_funcs = {}
+
 
 class Lmer(object):
 
@@ -108,6 +112,7 @@ class Lmer(object):
         self.sig_type = None
         self.factors_prev_ = None
         self.contrasts = None
+        self._emm_cache = {}
 
     def __repr__(self):
         out = "{}(fitted = {}, formula = {}, family = {})".format(
@@ -371,6 +376,8 @@ class Lmer(object):
         self._conf_int = conf_int
         self._REML = REML if self.family == "gaussian" else False
         self._set_R_stdout(verbose)
+        # Refitting invalidates any emmeans objects cached by post_hoc
+        self._emm_cache = {}
 
         if permute is True:
             raise TypeError(
@@ -856,20 +863,21 @@ class Lmer(object):
         else:
             re_form = "NA"
 
-        rstring = (
+        simulate_func = _simulate_funcs.get(re_form)
+        if simulate_func is None:
+            rstring = (
+                """
+                function(model,nsim){
+                out <- simulate(model,nsim,allow.new.levels=TRUE,re.form="""
+                + re_form
+                + """)
+                out
+                }
             """
-            function(model){
-            out <- simulate(model,"""
-            + str(num_datasets)
-            + """,allow.new.levels=TRUE,re.form="""
-            + re_form
-            + """)
-            out
-            }
-        """
-        )
-        simulate_func = robjects.r(rstring)
-        sims = simulate_func(self.model_obj)
+            )
+            simulate_func = robjects.r(rstring)
+            _simulate_funcs[re_form] = simulate_func
+        sims = simulate_func(self.model_obj, num_datasets)
         return pd.DataFrame(sims)
 
     def predict(self, data, use_rfx=False, pred_type="response", verbose=False):
@@ -1015,6 +1023,14 @@ class Lmer(object):
                     "All grouping_vars must be existing categorical variables (i.e. factors)"
                 )
 
+        # Repeated calls with the same arguments can reuse the R-side emmeans
+        # object and skip a marshaling round-trip across the rpy2 boundary
+        cache_key = (
+            tuple(marginal_vars),
+            tuple(grouping_vars) if grouping_vars else None,
+            p_adjust,
+        )
+
         # Need to figure out if marginal_vars is continuous or not to determine lstrends or emmeans call
         cont, factor = [], []
         for var in marginal_vars:
@@ -1115,12 +1131,19 @@ class Lmer(object):
             else:
                 raise ValueError("marginal_vars are not in model!")
 
-        func = robjects.r(rstring)
-        res = func(self.model_obj)
+        res = self._emm_cache.get(cache_key)
+        if res is None:
+            func = robjects.r(rstring)
+            res = func(self.model_obj)
+            self._emm_cache[cache_key] = res
         emmeans = importr("emmeans")
 
+        # Summarize the R-side object once; it's marshaled for both the
+        # marginal estimates and the contrasts below
+        res_summary = base.summary(res)
+
         # Marginal estimates
-        self.marginal_estimates = pd.DataFrame(base.summary(res)[0])
+        self.marginal_estimates = pd.DataFrame(res_summary[0])
         # Resort columns
         effect_names = list(self.marginal_estimates.columns[:-4])
         # this column name changes depending on whether we're doing post-hoc trends or means
@@ -1152,7 +1175,7 @@ class Lmer(object):
             )
 
         # Marginal Contrasts
-        self.marginal_contrasts = pd.DataFrame(base.summary(res)[1])
+        self.marginal_contrasts = pd.DataFrame(res_summary[1])
         if "t.ratio" in self.marginal_contrasts.columns:
             rename_dict = {
                 "t.ratio": "T-stat",
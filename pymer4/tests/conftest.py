@@ -0,0 +1,20 @@
+import os
+import pandas as pd
+import pytest
+from pymer4.utils import get_resource_path
+
+
+@pytest.fixture(scope="session")
+def sample_df():
+    """Parse sample_data.csv exactly once per test session. Tests that mutate the data (e.g. adding columns) should operate on sample_df.copy()."""
+    return pd.read_csv(
+        os.path.join(get_resource_path(), "sample_data.csv"),
+        dtype={
+            "Group": int,
+            "IV1": float,
+            "DV_l": int,
+            "DV": float,
+            "IV2": float,
+            "IV3": float,
+        },
+    )
@@ -36,6 +36,10 @@ import rpy2.robjects as robjects
 base = importr("base")
 MAX_INT = np.iinfo(np.int32).max
 
+# Merge the default and pandas converters once at import; merging them is not
+# free and pandas2R runs on every model fit/predict
+_pandas_converter = robjects.default_converter + pandas2ri.converter
+
 
 def get_resource_path():
     """ Get path sample data directory. """
@@ -569,6 +573,6 @@ def _df_meta_to_arr(df):
 
 def pandas2R(df):
     """Local conversion of pandas dataframe to R dataframe as recommended by rpy2"""
-    with localconverter(robjects.default_converter + pandas2ri.converter):
+    with localconverter(_pandas_converter):
         data = robjects.conversion.py2rpy(df)
     return data